@@ -7,93 +7,14 @@ Handles the BLOB encoding issue where IndexedDB stores data with metadata prefix
 Usage: ./extract_firefox_extension_data.py <database.sqlite> [output.json]
 """
 
-import sqlite3
 import json
 import sys
 
-def decode_key(key_blob):
-    """Decode key BLOB, trying different offsets to skip metadata bytes."""
-    if not key_blob:
-        return None
-
-    # Handle non-BLOB types (int, etc.)
-    if not isinstance(key_blob, bytes):
-        return str(key_blob)
-
-    # Try direct decode
-    try:
-        decoded = key_blob.decode('utf-8', errors='ignore').strip('\x00')
-        if decoded and decoded.isprintable():
-            return decoded
-    except:
-        pass
-
-    # Try skipping metadata prefix bytes (usually first few bytes)
-    for offset in range(min(20, len(key_blob))):
-        try:
-            test = key_blob[offset:].decode('utf-8', errors='ignore')
-            cleaned = ''.join(c for c in test if c.isprintable())
-            if cleaned and len(cleaned) >= 2:
-                return cleaned
-        except:
-            continue
-
-    return None
-
-def decode_data(data_blob):
-    """Decode data BLOB and extract JSON."""
-    if not data_blob:
-        return None
-
-    # Handle non-BLOB types (int, etc.)
-    if not isinstance(data_blob, bytes):
-        # Try to parse as JSON if it's a string
-        if isinstance(data_blob, str):
-            try:
-                return json.loads(data_blob)
-            except:
-                pass
-        return None
-
-    try:
-        # Decode as UTF-8
-        data_str = data_blob.decode('utf-8', errors='ignore')
-
-        # Find JSON start marker ([ or {)
-        json_start = -1
-        for i, char in enumerate(data_str):
-            if char == '[' or char == '{':
-                json_start = i
-                break
-
-        if json_start >= 0:
-            json_str = data_str[json_start:]
-            try:
-                return json.loads(json_str)
-            except json.JSONDecodeError:
-                return None
-
-        return None
-    except:
-        return None
-
-def extract_readable_text(data_blob):
-    """Extract all readable text strings from binary data."""
-    if not isinstance(data_blob, bytes):
-        return []
-
-    # Decode and extract strings of printable characters
-    decoded = data_blob.decode('utf-8', errors='ignore')
-
-    # Extract sequences of printable characters (minimum 3 chars)
-    import re
-    strings = re.findall(r'[\x20-\x7e]{3,}', decoded)
-
-    return [s.strip() for s in strings if s.strip()]
+from firefox_idb import OUTPUT_BUFFER_SIZE, open_readonly, decode_key, decode_data, extract_readable_text
 
 def extract_data(db_path, verbose=False, extract_text=False):
     """Extract all data from the database."""
-    conn = sqlite3.connect(db_path)
+    conn = open_readonly(db_path)
     cursor = conn.cursor()
 
     # Check if this is an IndexedDB database (has object_data table)
@@ -102,14 +23,14 @@ def extract_data(db_path, verbose=False, extract_text=False):
         conn.close()
         return None  # Not an IndexedDB database
 
-    cursor.execute("SELECT key, data FROM object_data")
-    rows = cursor.fetchall()
-    conn.close()
+    cursor.execute("SELECT COUNT(*) FROM object_data")
+    print(f"Found {cursor.fetchone()[0]} entries in database\n")
 
     result = {}
-    print(f"Found {len(rows)} entries in database\n")
 
-    for i, (key_blob, data_blob) in enumerate(rows, 1):
+    # Stream rows off the cursor so only one BLOB is held at a time
+    cursor.execute("SELECT key, data FROM object_data")
+    for i, (key_blob, data_blob) in enumerate(cursor, 1):
         key = decode_key(key_blob)
 
         if extract_text:
@@ -135,7 +56,11 @@ def extract_data(db_path, verbose=False, extract_text=False):
 
             if isinstance(data_blob, bytes):
                 print(f"  Data (hex): {data_blob[:60].hex()}")
-                decoded_preview = data_blob.decode('utf-8', errors='ignore')[:100]
+                # Only decode enough of the BLOB for the preview; fall back to
+                # the whole thing if invalid bytes left the prefix short
+                decoded_preview = data_blob[:400].decode('utf-8', errors='ignore')[:100]
+                if len(decoded_preview) < 100 and len(data_blob) > 400:
+                    decoded_preview = data_blob.decode('utf-8', errors='ignore')[:100]
                 print(f"  Data (preview): {repr(decoded_preview)}")
             else:
                 print(f"  Data (raw): {data_blob}")
@@ -153,6 +78,7 @@ def extract_data(db_path, verbose=False, extract_text=False):
             if not verbose:
                 print(f"✗ Could not decode key")
 
+    conn.close()
     return result
 
 def main():
@@ -190,13 +116,15 @@ def main():
             sys.exit(0)
 
         if output_path:
-            with open(output_path, 'w') as f:
+            with open(output_path, 'w', buffering=OUTPUT_BUFFER_SIZE) as f:
                 json.dump(data, f, indent=2)
             print(f"\n✓✓✓ Saved to: {output_path}")
         else:
             if not verbose and not extract_text:
                 print(f"\nRecovered data:")
-                print(json.dumps(data, indent=2))
+                # Stream straight to stdout rather than building the whole string
+                json.dump(data, sys.stdout, indent=2)
+                print()
             elif extract_text and data:
                 print(f"\n✓✓✓ Extracted text from {len(data)} entries")
 
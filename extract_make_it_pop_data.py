@@ -11,41 +11,33 @@ Skips all non-conforming entries.
 Usage: ./extract_make_it_pop_data.py <database.sqlite> [output.json]
 """
 
-import sqlite3
 import json
 import sys
 import re
 
-def extract_field_value(decoded, field_name, next_field_pos=None):
-    """Extract value after a field name in the decoded binary data."""
-    pos = decoded.find(field_name)
-    if pos == -1:
-        return None
+from firefox_idb import OUTPUT_BUFFER_SIZE, open_readonly, printable_text, compile_field_pattern
 
-    # Make sure it's a standalone field name
-    before_ok = pos == 0 or not decoded[pos-1].isalnum()
-    after_ok = pos + len(field_name) >= len(decoded) or not decoded[pos + len(field_name)].isalnum()
-    if not (before_ok and after_ok):
-        return None
+GROUP_FIELDS = ['id', 'name', 'lightBgColor', 'lightTextColor', 'darkBgColor',
+                'darkTextColor', 'phrases']
+DOMAIN_FIELDS = ['id', 'pattern', 'mode', 'groupIds']
 
-    # Start after the field name
-    value_start = pos + len(field_name)
+# Byte strings whose presence marks a BLOB as a likely Group or Domain
+GROUP_INDICATORS = [b'lightBgColor', b'darkBgColor', b'phrases']
+DOMAIN_INDICATORS = [b'pattern', b'groupIds']
 
-    # End at next field or specified position
-    if next_field_pos is not None:
-        value_end = next_field_pos
-    else:
-        value_end = len(decoded)
+GROUP_FIELD_RE = compile_field_pattern(GROUP_FIELDS)
+DOMAIN_FIELD_RE = compile_field_pattern(DOMAIN_FIELDS)
 
-    value_region = decoded[value_start:value_end]
+def find_field_positions(field_re, data_blob):
+    """Map each field name to its first standalone position, in one pass.
 
-    # Extract printable characters
-    printable = []
-    for c in value_region:
-        if c.isprintable() and ord(c) >= 32:
-            printable.append(c)
-
-    return ''.join(printable).strip()
+    Fields are inserted in the order they appear, so the result is already
+    sorted by position.
+    """
+    field_positions = {}
+    for match in field_re.finditer(data_blob):
+        field_positions.setdefault(match.group().decode(), match.start())
+    return field_positions
 
 def parse_make_it_pop_entry(data_blob):
     """
@@ -55,36 +47,26 @@ def parse_make_it_pop_entry(data_blob):
     if not isinstance(data_blob, bytes):
         return None, None
 
-    decoded = data_blob.decode('utf-8', errors='ignore')
-
     # Check for Group fields
-    group_indicators = ['lightBgColor', 'darkBgColor', 'phrases']
-    has_group_fields = sum(1 for field in group_indicators if field in decoded) >= 2
+    has_group_fields = sum(1 for field in GROUP_INDICATORS if field in data_blob) >= 2
 
     # Check for Domain fields
-    domain_indicators = ['pattern', 'groupIds']
-    has_domain_fields = sum(1 for field in domain_indicators if field in domain_indicators) >= 1
+    has_domain_fields = sum(1 for field in DOMAIN_INDICATORS if field in data_blob) >= 1
+
+    # Most rows are neither; skip them before any field parsing
+    if not (has_group_fields or has_domain_fields):
+        return None, None
 
     if has_group_fields:
         # Parse as Group
         group = {}
 
         # Find all field positions
-        fields = ['id', 'name', 'lightBgColor', 'lightTextColor', 'darkBgColor',
-                  'darkTextColor', 'phrases']
-        field_positions = {}
-
-        for field in fields:
-            pos = decoded.find(field)
-            if pos != -1:
-                # Verify it's a standalone field
-                before_ok = pos == 0 or not decoded[pos-1].isalnum()
-                after_ok = pos + len(field) >= len(decoded) or not decoded[pos + len(field)].isalnum()
-                if before_ok and after_ok:
-                    field_positions[field] = pos
-
-        # Sort by position
-        sorted_fields = sorted(field_positions.items(), key=lambda x: x[1])
+        fields = GROUP_FIELDS
+        field_positions = find_field_positions(GROUP_FIELD_RE, data_blob)
+
+        # Already in position order, since the sweep runs front to back
+        sorted_fields = list(field_positions.items())
 
         # Extract values
         for i, (field, pos) in enumerate(sorted_fields):
@@ -94,13 +76,10 @@ def parse_make_it_pop_entry(data_blob):
             if i + 1 < len(sorted_fields):
                 value_end = sorted_fields[i + 1][1]
             else:
-                value_end = len(decoded)
-
-            value_region = decoded[value_start:value_end]
+                value_end = len(data_blob)
 
             # Extract printable text
-            value_text = ''.join(c for c in value_region if c.isprintable() and ord(c) >= 32)
-            value_text = value_text.strip()
+            value_text = printable_text(data_blob[value_start:value_end]).strip()
 
             # Clean up - remove other field names that might have leaked in
             for other_field in fields:
@@ -128,18 +107,10 @@ def parse_make_it_pop_entry(data_blob):
         # Parse as Domain
         domain = {}
 
-        fields = ['id', 'pattern', 'mode', 'groupIds']
-        field_positions = {}
+        fields = DOMAIN_FIELDS
+        field_positions = find_field_positions(DOMAIN_FIELD_RE, data_blob)
 
-        for field in fields:
-            pos = decoded.find(field)
-            if pos != -1:
-                before_ok = pos == 0 or not decoded[pos-1].isalnum()
-                after_ok = pos + len(field) >= len(decoded) or not decoded[pos + len(field)].isalnum()
-                if before_ok and after_ok:
-                    field_positions[field] = pos
-
-        sorted_fields = sorted(field_positions.items(), key=lambda x: x[1])
+        sorted_fields = list(field_positions.items())
 
         for i, (field, pos) in enumerate(sorted_fields):
             value_start = pos + len(field)
@@ -147,11 +118,9 @@ def parse_make_it_pop_entry(data_blob):
             if i + 1 < len(sorted_fields):
                 value_end = sorted_fields[i + 1][1]
             else:
-                value_end = len(decoded)
+                value_end = len(data_blob)
 
-            value_region = decoded[value_start:value_end]
-            value_text = ''.join(c for c in value_region if c.isprintable() and ord(c) >= 32)
-            value_text = value_text.strip()
+            value_text = printable_text(data_blob[value_start:value_end]).strip()
 
             # Clean up
             for other_field in fields:
@@ -175,18 +144,17 @@ def parse_make_it_pop_entry(data_blob):
 
 def extract_make_it_pop_data(db_path):
     """Extract make-it-pop groups and domains from database."""
-    conn = sqlite3.connect(db_path)
+    conn = open_readonly(db_path)
     cursor = conn.cursor()
-    cursor.execute("SELECT key, data FROM object_data")
-    rows = cursor.fetchall()
-    conn.close()
+    cursor.execute("SELECT COUNT(*) FROM object_data")
+    print(f"Scanning {cursor.fetchone()[0]} entries...\n")
 
     groups = []
     domains = []
 
-    print(f"Scanning {len(rows)} entries...\n")
-
-    for i, (key_blob, data_blob) in enumerate(rows, 1):
+    # Stream rows off the cursor so only one BLOB is held at a time
+    cursor.execute("SELECT key, data FROM object_data")
+    for i, (key_blob, data_blob) in enumerate(cursor, 1):
         entry_type, data = parse_make_it_pop_entry(data_blob)
 
         if entry_type == 'group':
@@ -199,6 +167,7 @@ def extract_make_it_pop_data(db_path):
             print(f"✓ Entry {i}: Domain - {pattern}")
         # Silently skip non-matching entries
 
+    conn.close()
     return {
         "groups": groups,
         "domains": domains
@@ -224,13 +193,15 @@ def main():
         print(f"  Domains found: {len(result['domains'])}")
 
         if output_path:
-            with open(output_path, 'w') as f:
+            with open(output_path, 'w', buffering=OUTPUT_BUFFER_SIZE) as f:
                 json.dump(result, f, indent=2)
             print(f"\n✓✓✓ Saved to: {output_path}")
         else:
             print(f"\n{'='*60}")
             print("Recovered data:")
-            print(json.dumps(result, indent=2))
+            # Stream straight to stdout rather than building the whole string
+            json.dump(result, sys.stdout, indent=2)
+            print()
 
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -5,43 +5,31 @@ Find Firefox extension databases containing a keyword.
 Usage: ./find_firefox_extension.py <search_term> [storage_path]
 """
 
-import sqlite3
 import sys
-import glob
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
-def find_extension_databases(search_path):
-    """Find all Firefox extension database files."""
-    pattern = os.path.join(search_path, "moz-extension+++*", "idb", "*.sqlite")
-    return glob.glob(pattern)
+from firefox_idb import open_readonly, find_extension_databases
 
 def search_database(db_path, search_term):
     """Check if database contains the search term."""
     try:
-        conn = sqlite3.connect(db_path)
+        conn = open_readonly(db_path)
         cursor = conn.cursor()
-        cursor.execute("SELECT key, data FROM object_data")
-        rows = cursor.fetchall()
+        # Let SQLite do the substring match and stop at the first hit, rather
+        # than pulling every BLOB into Python. SQLite's lower() only folds
+        # ASCII, so the term is lowered in Python to fold it fully
+        term = search_term.lower()
+        cursor.execute(
+            "SELECT 1 FROM object_data"
+            " WHERE instr(lower(CAST(key AS TEXT)), ?) > 0"
+            " OR instr(lower(CAST(data AS TEXT)), ?) > 0"
+            " LIMIT 1",
+            (term, term))
+        found = cursor.fetchone() is not None
         conn.close()
-
-        for key_blob, data_blob in rows:
-            # Handle different data types (BLOB, int, etc.)
-            key_str = ''
-            data_str = ''
-
-            if isinstance(key_blob, bytes):
-                key_str = key_blob.decode('utf-8', errors='ignore')
-            elif key_blob is not None:
-                key_str = str(key_blob)
-
-            if isinstance(data_blob, bytes):
-                data_str = data_blob.decode('utf-8', errors='ignore')
-            elif data_blob is not None:
-                data_str = str(data_blob)
-
-            if search_term.lower() in key_str.lower() or search_term.lower() in data_str.lower():
-                return True
-        return False
+        return found
     except Exception as e:
         print(f"Error reading {db_path}: {e}", file=sys.stderr)
         return False
@@ -65,6 +53,9 @@ def main():
     if len(sys.argv) < 2:
         print("Usage: ./find_firefox_extension.py <search_term> [storage_path]")
         print("Example: ./find_firefox_extension.py 'example.com' ~/.mozilla/firefox/xyz.default/storage/default")
+        print()
+        print("Note: Matching ignores case, but only ASCII letters are case-folded in the")
+        print("      stored data, e.g. 'café' finds 'Café' but not 'CAFÉ'")
         sys.exit(1)
 
     search_term = sys.argv[1]
@@ -93,16 +84,16 @@ def main():
     print(f"Searching for '{search_term}' in {search_path}")
     print()
 
-    databases = find_extension_databases(search_path)
+    databases = list(find_extension_databases(search_path))
 
     if not databases:
         print("No extension databases found")
         sys.exit(1)
 
-    matches = []
-    for db_path in databases:
-        if search_database(db_path, search_term):
-            matches.append(db_path)
+    # Each database is independent, so search them in parallel
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(partial(search_database, search_term=search_term), databases)
+        matches = [db_path for db_path, found in zip(databases, results) if found]
 
     if matches:
         print(f"Found {len(matches)} extension(s) containing '{search_term}':")
@@ -0,0 +1,158 @@
+"""
+Shared helpers for the Firefox extension IndexedDB recovery tools.
+
+Opens extension databases, locates them inside a profile, and decodes the
+key/data BLOBs IndexedDB stores (metadata prefix bytes + payload).
+"""
+
+import sqlite3
+import json
+import os
+import re
+import urllib.parse
+
+# Runs of at least 3 printable ASCII characters
+PRINTABLE_RUN_RE = re.compile(rb'[\x20-\x7e]{3,}')
+
+# Bytes that can never be printable: ASCII control characters and DEL
+CONTROL_BYTES = bytes(range(0x20)) + b'\x7f'
+
+# Buffer size for JSON output files. json.dump writes many small chunks, so
+# a large buffer turns them into a few big write() calls
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# raw_decode stops at the end of the first JSON value, so trailing padding
+# after it doesn't force a second parse
+JSON_DECODER = json.JSONDecoder()
+
+def readonly_uri(db_path):
+    """Build a SQLite URI that opens db_path read-only."""
+    return f"file:{urllib.parse.quote(db_path)}?mode=ro"
+
+def tune_for_reading(conn, schema="main"):
+    """Memory-map and enlarge the page cache of an opened/attached database."""
+    conn.execute(f"PRAGMA {schema}.mmap_size = 268435456")
+    conn.execute(f"PRAGMA {schema}.cache_size = -65536")
+
+def open_readonly(db_path):
+    """Open a SQLite database read-only, tuned for scanning large BLOBs."""
+    conn = sqlite3.connect(readonly_uri(db_path), uri=True)
+    tune_for_reading(conn)
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+def find_extension_databases(search_path):
+    """Find all Firefox extension database files."""
+    # Walk moz-extension+++*/idb/*.sqlite by hand: scandir entries carry their
+    # file type, so this avoids glob's fnmatch and per-entry stat calls
+    try:
+        with os.scandir(search_path) as entries:
+            extension_dirs = [entry.path for entry in entries
+                              if entry.name.startswith("moz-extension+++") and entry.is_dir()]
+    except OSError:
+        return
+
+    for extension_dir in extension_dirs:
+        try:
+            with os.scandir(os.path.join(extension_dir, "idb")) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".sqlite") and entry.is_file():
+                        yield entry.path
+        except OSError:
+            continue
+
+def compile_field_pattern(fields):
+    """Compile a pattern matching any of the given standalone field names."""
+    names = b'|'.join(re.escape(field.encode()) for field in fields)
+    return re.compile(rb'(?<![A-Za-z0-9])(?:' + names + rb')(?![A-Za-z0-9])')
+
+def printable_text(region):
+    """Decode a raw BLOB region, keeping only printable characters."""
+    if not region.isascii():
+        # Drop invalid sequences first, so deleting a control byte can't
+        # splice the bytes around it into a new character
+        region = region.decode('utf-8', errors='ignore').encode('utf-8')
+
+    # Strip control bytes in C, instead of testing every decoded character
+    # in Python
+    text = region.translate(None, CONTROL_BYTES).decode('utf-8')
+    if not text.isprintable():
+        # Non-ASCII non-printables (e.g. U+0085) slipped past the byte filter
+        text = ''.join(c for c in text if c.isprintable())
+    return text
+
+def decode_key(key_blob):
+    """Decode key BLOB, dropping the metadata bytes around the key text."""
+    if not key_blob:
+        return None
+
+    # Handle non-BLOB types (int, etc.)
+    if not isinstance(key_blob, bytes):
+        return str(key_blob)
+
+    # Metadata prefix bytes are non-printable, so filtering them out in one
+    # pass gives the same text as probing successive start offsets
+    cleaned = printable_text(key_blob)
+    if len(cleaned) >= 2:
+        return cleaned
+
+    # A single character is only trusted when it's the entire key
+    if cleaned and cleaned == key_blob.decode('utf-8', errors='ignore').strip('\x00'):
+        return cleaned
+
+    return None
+
+def parse_json_prefix(payload):
+    """Parse the JSON value at the start of payload, ignoring anything after it."""
+    return JSON_DECODER.raw_decode(payload)[0]
+
+def decode_data(data_blob):
+    """Decode data BLOB and extract JSON."""
+    if not data_blob:
+        return None
+
+    # Handle non-BLOB types (int, etc.)
+    if not isinstance(data_blob, bytes):
+        # Try to parse as JSON if it's a string
+        if isinstance(data_blob, str):
+            try:
+                return json.loads(data_blob)
+            except:
+                pass
+        return None
+
+    try:
+        # Find JSON start marker ([ or {) on the raw bytes, so the metadata
+        # prefix never needs decoding
+        starts = [pos for pos in (data_blob.find(b'{'), data_blob.find(b'[')) if pos >= 0]
+        if not starts:
+            return None
+
+        json_bytes = data_blob[min(starts):]
+
+        # Decode as UTF-8 ourselves: json.loads(bytes) would sniff for
+        # UTF-16/32 and let lone surrogates through. Only fall back to a
+        # lossy decode when the payload isn't clean UTF-8
+        try:
+            json_str = json_bytes.decode('utf-8')
+        except UnicodeDecodeError:
+            json_str = json_bytes.decode('utf-8', errors='ignore')
+
+        try:
+            return parse_json_prefix(json_str)
+        except json.JSONDecodeError:
+            return None
+    except:
+        return None
+
+def extract_readable_text(data_blob):
+    """Extract all readable text strings from binary data."""
+    # Skip non-BLOBs and BLOBs too short to hold a single run
+    if not isinstance(data_blob, bytes) or len(data_blob) < 3:
+        return []
+
+    # Extract sequences of printable ASCII characters (minimum 3 chars)
+    # straight from the raw bytes, without decoding the whole BLOB first
+    strings = (m.decode('ascii').strip() for m in PRINTABLE_RUN_RE.findall(data_blob))
+
+    return [s for s in strings if s]
@@ -8,10 +8,21 @@ This is a heuristic parser - it won't be perfect but should extract most data.
 Usage: ./parse_indexeddb_structured.py <database.sqlite> [output.json]
 """
 
-import sqlite3
 import json
 import sys
-import re
+
+from firefox_idb import OUTPUT_BUFFER_SIZE, open_readonly, printable_text, compile_field_pattern
+
+# Common field names: id, name, data, value, etc.
+KNOWN_FIELDS = ['id', 'name', 'data', 'value', 'type', 'enabled', 'disabled',
+                'url', 'pattern', 'regex', 'rule', 'rules', 'config', 'settings',
+                'options', 'preferences', 'groups', 'items', 'list', 'array',
+                'timestamp', 'date', 'created', 'updated', 'modified', 'title',
+                'description', 'category', 'tags', 'status']
+KNOWN_FIELD_SET = frozenset(KNOWN_FIELDS)
+
+# Any known field that looks like a field name (surrounded by non-alphanumeric)
+KNOWN_FIELD_RE = compile_field_pattern(KNOWN_FIELDS)
 
 def parse_structured_data(data_blob):
     """
@@ -22,30 +33,11 @@ def parse_structured_data(data_blob):
         return None
 
     result = {}
-    decoded = data_blob.decode('utf-8', errors='ignore')
 
     # Strategy 1: Look for field names with known patterns
-    # Common field names: id, name, data, value, etc.
-    known_fields = ['id', 'name', 'data', 'value', 'type', 'enabled', 'disabled',
-                    'url', 'pattern', 'regex', 'rule', 'rules', 'config', 'settings',
-                    'options', 'preferences', 'groups', 'items', 'list', 'array',
-                    'timestamp', 'date', 'created', 'updated', 'modified', 'title',
-                    'description', 'category', 'tags', 'status']
-
-    # Find each known field in the decoded data
-    field_positions = []
-    for field in known_fields:
-        pos = decoded.find(field)
-        while pos != -1:
-            # Check if this looks like a field name (surrounded by non-alphanumeric)
-            before_ok = pos == 0 or not decoded[pos-1].isalnum()
-            after_ok = pos + len(field) >= len(decoded) or not decoded[pos + len(field)].isalnum()
-            if before_ok and after_ok:
-                field_positions.append((pos, field))
-            pos = decoded.find(field, pos + 1)
-
-    # Sort by position
-    field_positions.sort()
+    # Find every known field in one pass over the raw bytes; matches come
+    # back in position order
+    field_positions = [(m.start(), m.group().decode()) for m in KNOWN_FIELD_RE.finditer(data_blob)]
 
     # Extract value after each field
     for i, (pos, field) in enumerate(field_positions):
@@ -54,45 +46,34 @@ def parse_structured_data(data_blob):
         if i + 1 < len(field_positions):
             end = field_positions[i + 1][0]
         else:
-            end = len(decoded)
-
-        # Extract value region
-        value_region = decoded[start:end]
+            end = len(data_blob)
 
         # Skip control chars and extract printable content
-        printable = []
-        for c in value_region:
-            if c.isprintable() and c not in '\x00\x01\x02\x03\x04\x05\x06\x07\x08\x0b\x0c\x0e\x0f':
-                printable.append(c)
-            elif printable and c == ' ':
-                printable.append(c)
-
-        value_text = ''.join(printable).strip()
+        value_text = printable_text(data_blob[start:end]).strip()
 
         if value_text and len(value_text) > 0:
             # Skip if it's just another field name
-            if value_text.lower() not in known_fields:
+            if value_text.lower() not in KNOWN_FIELD_SET:
                 result[field] = value_text[:500]  # Limit value length
 
     return result if result else None
 
 def extract_all_data(db_path):
     """Extract structured data from all entries."""
-    conn = sqlite3.connect(db_path)
+    conn = open_readonly(db_path)
     cursor = conn.cursor()
-    cursor.execute("SELECT key, data FROM object_data")
-    rows = cursor.fetchall()
-    conn.close()
+    cursor.execute("SELECT COUNT(*) FROM object_data")
+    print(f"Found {cursor.fetchone()[0]} entries in database\n")
 
     results = []
-    print(f"Found {len(rows)} entries in database\n")
 
-    for i, (key_blob, data_blob) in enumerate(rows, 1):
+    # Stream rows off the cursor so only one BLOB is held at a time
+    cursor.execute("SELECT key, data FROM object_data")
+    for i, (key_blob, data_blob) in enumerate(cursor, 1):
         # Decode key
         if isinstance(key_blob, bytes):
-            key = key_blob.decode('utf-8', errors='ignore').strip('\x00')
-            # Clean up key
-            key = ''.join(c for c in key if c.isprintable()).strip()
+            # Keep only printable characters, filtered in C via bytes.translate
+            key = printable_text(key_blob).strip()
         else:
             key = str(key_blob) if key_blob else f"entry_{i}"
 
@@ -109,6 +90,7 @@ def extract_all_data(db_path):
         else:
             print(f"✗ Entry {i} (key: {key}) - could not parse")
 
+    conn.close()
     return results
 
 def main():
@@ -126,13 +108,15 @@ def main():
         results = extract_all_data(db_path)
 
         if output_path:
-            with open(output_path, 'w') as f:
+            with open(output_path, 'w', buffering=OUTPUT_BUFFER_SIZE) as f:
                 json.dump(results, f, indent=2)
             print(f"\n✓✓✓ Saved {len(results)} entries to: {output_path}")
         else:
             print(f"\n{'='*60}")
             print(f"Recovered {len(results)} entries:")
-            print(json.dumps(results, indent=2))
+            # Stream straight to stdout rather than building the whole string
+            json.dump(results, sys.stdout, indent=2)
+            print()
 
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
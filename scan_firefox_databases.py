@@ -13,27 +13,52 @@ import sqlite3
 import sys
 import glob
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-def is_indexeddb_database(db_path):
+from firefox_idb import readonly_uri, tune_for_reading
+
+# Threads used to check candidate files
+SCAN_THREADS = 32
+
+def is_indexeddb_database(conn, db_path):
     """Check if a database is an IndexedDB database with data."""
+    # Attach to the shared connection rather than opening a new one per file
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        conn.execute("ATTACH DATABASE ? AS candidate", (readonly_uri(db_path),))
+    except Exception as e:
+        return False, 0
+
+    try:
+        tune_for_reading(conn, "candidate")
 
         # Check if it has object_data table
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='object_data'")
-        if not cursor.fetchone():
-            conn.close()
+        if not conn.execute("SELECT name FROM candidate.sqlite_master WHERE type='table' AND name='object_data'").fetchone():
             return False, 0
 
         # Count how many entries it has
-        cursor.execute("SELECT COUNT(*) FROM object_data")
-        count = cursor.fetchone()[0]
-
-        conn.close()
+        count = conn.execute("SELECT COUNT(*) FROM candidate.object_data").fetchone()[0]
         return True, count
     except Exception as e:
         return False, 0
+    finally:
+        conn.execute("DETACH DATABASE candidate")
+
+def scan_batch(paths):
+    """Check a batch of files over one shared SQLite connection."""
+    # Each file is attached to this connection in turn.
+    # uri=True lets ATTACH take the read-only file: URIs
+    conn = sqlite3.connect(":memory:", uri=True)
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+    results = []
+    for path in paths:
+        try:
+            results.append((path, is_indexeddb_database(conn, path), None))
+        except Exception as e:
+            results.append((path, None, str(e)))
+
+    conn.close()
+    return results
 
 def scan_databases(paths):
     """Scan multiple database files."""
@@ -41,21 +66,28 @@ def scan_databases(paths):
     other_dbs = []
     errors = []
 
-    for path in paths:
-        if not os.path.exists(path):
-            continue
-
-        if not os.path.isfile(path):
-            continue
-
-        try:
-            is_idb, count = is_indexeddb_database(path)
-            if is_idb:
-                indexeddb_found.append((path, count))
-            else:
-                other_dbs.append(path)
-        except Exception as e:
-            errors.append((path, str(e)))
+    # Skip missing paths and directories
+    paths = [path for path in paths if os.path.isfile(path)]
+    if not paths:
+        return indexeddb_found, other_dbs, errors
+
+    # Scanning is mostly file opens and SQLite I/O, which release the GIL, so
+    # split the files into contiguous batches and check them on threads
+    batch_size = -(-len(paths) // SCAN_THREADS)
+    batches = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+
+    with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+        for results in executor.map(scan_batch, batches):
+            for path, result, error in results:
+                if error is not None:
+                    errors.append((path, error))
+                    continue
+
+                is_idb, count = result
+                if is_idb:
+                    indexeddb_found.append((path, count))
+                else:
+                    other_dbs.append(path)
 
     return indexeddb_found, other_dbs, errors
 